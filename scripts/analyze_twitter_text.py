@@ -61,25 +61,40 @@ def load_dicts(droot: str):
         if t in team_set:
             add_alias(a, t)
 
-    # pre-build regex list (longest alias first)
+    # pre-build a character trie over all aliases (one walk per start position finds
+    # every alias there), plus each alias's rank in longest-first order for output order
     aliases_sorted = sorted(alias_to_team.keys(), key=len, reverse=True)
-    patterns = [(a, re.compile(rf'(?<![A-Z0-9]){re.escape(a)}(?![A-Z0-9])', re.I)) for a in aliases_sorted]
-    return alias_to_team, patterns
-
-ALIAS_TO, ALIAS_PATTERNS = load_dicts(args.dict)
+    trie = {}
+    for a in aliases_sorted:
+        node = trie
+        for ch in a:
+            node = node.setdefault(ch, {})
+        node[None] = a
+    rank = {a: i for i, a in enumerate(aliases_sorted)}
+    return alias_to_team, trie, rank
+
+ALIAS_TO, ALIAS_TRIE, ALIAS_RANK = load_dicts(args.dict)
+WORD_CH = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
 
 def detect_teams(text: str):
     T = (text or "").upper()
-    hits = []
-    for alias, rx in ALIAS_PATTERNS:
-        if rx.search(T):
-            hits.append(ALIAS_TO[alias])
+    n = len(T)
+    found = set()
+    for i in range(n):
+        if i and T[i-1] in WORD_CH:
+            continue
+        node, j = ALIAS_TRIE, i
+        while j < n:
+            node = node.get(T[j])
+            if node is None:
+                break
+            j += 1
+            a = node.get(None)
+            if a is not None and (j == n or T[j] not in WORD_CH):
+                found.add(a)
+    hits = [ALIAS_TO[a] for a in sorted(found, key=ALIAS_RANK.__getitem__)]
     # dedup preserve order
-    seen = set(); out = []
-    for t in hits:
-        if t not in seen:
-            seen.add(t); out.append(t)
-    return out
+    return list(dict.fromkeys(hits))
 
 # ---------------------------- load tweets -----------------------
 def load_tweets(path: str) -> pd.DataFrame:
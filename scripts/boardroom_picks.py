@@ -32,6 +32,7 @@ ABBREV_HINTS = set((
 ))
 ABBREV_RE = re.compile(r'\b([A-Z]{2,4})\b')
 PCT_RE = re.compile(r'(\b\d{1,3})\s*%')
+ABBREV_LINE_RE = re.compile(r'\b([A-Z]{2,4})\s*[+-]\d+(?:\.\d+)?\b')
 
 def parse_args():
     ap = argparse.ArgumentParser(description="Make Boardroom 5★/4★ picks from signals (and optional splits).")
@@ -73,7 +74,7 @@ def infer_entity(row):
     for tok in uppers:
         if tok in ABBREV_HINTS:
             return tok
-    m = re.search(r'\b([A-Z]{2,4})\s*[+-]\d+(?:\.\d+)?\b', row["text"].upper())
+    m = ABBREV_LINE_RE.search(row["text"].upper())
     if m:
         return m.group(1)
     return "UNKNOWN"
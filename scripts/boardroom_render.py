@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse, math, pandas as pd
 from datetime import datetime, timezone
+from pathlib import Path
 
 def decay_weight(ts, now, tau_hours=24):
     if pd.isna(ts): return 0.0
@@ -60,8 +61,9 @@ def load_splits(path, hours):
         # fall back: order-agnostic key from raw strings if present
         a = df.get("away_team","").astype(str).str.upper().str.strip()
         h = df.get("home_team","").astype(str).str.upper().str.strip()
-        df["game_key"] = a.where(a<=h, h + "|" + a).where(a<=h, a + "|" + h)
-        df["game_key"] = df["game_key"].where(df["game_key"].str.contains("|", regex=False), a + "|" + h)
+        # AWAY|HOME, as before: clv_rlm_boost diffs lines within a key, and lines
+        # are relative to the listed side, so orientations must not be merged
+        df["game_key"] = a.str.cat(h, sep="|")
     if "line" not in df.columns:
         df["line"] = None
     return df
@@ -106,7 +108,7 @@ def write_md(rows, star5, star4, md_path):
                 lines.append("")
         if not found:
             lines.append("_None at this time._\n")
-    open(md_path,"w",encoding="utf-8").write("\n".join(lines))
+    Path(md_path).write_text("\n".join(lines), encoding="utf-8")
 
 def main():
     ap = argparse.ArgumentParser()
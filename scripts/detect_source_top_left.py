@@ -19,6 +19,9 @@ KEYMAP = [
     (r"\bCOVERS\b",                "COVERS_FAM"),
     (r"\bPREGAME\b",               "Pregame"),
 ]
+KEYMAP = [(re.compile(pat), label) for pat, label in KEYMAP]
+NONTOKEN_RX = re.compile(r"[^A-Z0-9 _-]")
+IMG_EXTS    = (".png",".jpg",".jpeg",".webp")
 
 def detect_source_from_corner(img_bgr):
     """Crop top-left corner, enhance, OCR, and map to a source."""
@@ -59,10 +62,10 @@ def detect_source_from_corner(img_bgr):
         for cand in candidates:
             config = "--oem 3 --psm 6"
             txt = pytesseract.image_to_string(cand, config=config)
-            txtU = re.sub(r"[^A-Z0-9 _-]", " ", txt.upper())
+            txtU = NONTOKEN_RX.sub(" ", txt.upper())
             texts.append(txtU)
             for pat, label in KEYMAP:
-                if re.search(pat, txtU):
+                if pat.search(txtU):
                     return label, txtU
 
     # Nothing matched; return aggregated text for debugging
@@ -81,7 +84,7 @@ def scan_images(root, since_hours):
             p = os.path.join(base, n)
             try:
                 # skip non-images by extension
-                if not re.search(r"\.(png|jpe?g|webp)$", n, re.I):
+                if not n.lower().endswith(IMG_EXTS):
                     continue
                 if cutoff:
                     ts = datetime.fromtimestamp(os.path.getmtime(p), tz=ZoneInfo("America/Chicago"))
@@ -111,13 +114,12 @@ def main():
             continue
         label, saw = detect_source_from_corner(img)
         counts[label] = counts.get(label, 0) + 1
-        rows.append({"file": fp, "detected_source": label, "corner_text_sample": saw[:200]})
+        rows.append((fp, label, saw[:200]))
 
     with open(args.out, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["file","detected_source","corner_text_sample"])
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w = csv.writer(f)
+        w.writerow(["file","detected_source","corner_text_sample"])
+        w.writerows(rows)
 
     print("=== Detected sources (top-left OCR) ===")
     for k in sorted(counts):
@@ -2,7 +2,7 @@
 # Reads a published Google Sheets CSV of tweets, detects teams with dictionaries,
 # keeps ONLY same-league pairs, and writes twitter_resolved.csv.
 
-import argparse, os, re, json
+import argparse, os, json
 import pandas as pd
 from collections import defaultdict
 
@@ -21,7 +21,6 @@ def load_dictionaries(droot: str):
     }
     team_to_league = {}
     alias_to_teams = defaultdict(set)
-    patterns = []
 
     for lg, fn in files.items():
         if not os.path.isfile(fn):
@@ -30,27 +29,38 @@ def load_dictionaries(droot: str):
         for team, aliases in d.items():
             team_to_league[team] = lg
             for a in aliases + [team]:
-                norm = re.sub(r"\s+", " ", a.strip()).upper()
+                norm = " ".join(a.split()).upper()
                 alias_to_teams[norm].add(team)
 
-    for alias, teams in alias_to_teams.items():
-        toks = re.escape(alias)
-        rx = re.compile(rf"(?i)(?<![A-Za-z]){toks}(?![A-Za-z])")
-        patterns.append((rx, alias, list(teams)))
+    # alias index: {alias: (rank, [teams])} plus the distinct alias lengths, so
+    # detect_teams can hash-probe text windows instead of running a regex per alias
+    aliases = {alias: (i, list(teams)) for i, (alias, teams) in enumerate(alias_to_teams.items())}
+    lengths = sorted({len(a) for a in aliases}, reverse=True)
+    return team_to_league, (aliases, lengths)
 
-    return team_to_league, patterns
+LETTERS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
 
-def detect_teams(text, patterns, team_to_league):
+def detect_teams(text, alias_index, team_to_league):
+    """(team, league, pos) for every alias hit bounded by non-letters, ordered by pos."""
+    aliases, lengths = alias_index
     textU = str(text or "").upper()
+    n = len(textU)
     hits = []
-    for rx, alias, teams in patterns:
-        for m in rx.finditer(textU):
-            pos = m.start()
+    for pos in range(n):
+        if pos and textU[pos-1] in LETTERS:
+            continue
+        at = []
+        for L in lengths:
+            end = pos + L
+            if end > n or (end < n and textU[end] in LETTERS):
+                continue
+            hit = aliases.get(textU[pos:end])
+            if hit:
+                at.append(hit)
+        # same-position hits keep the old alias order
+        for _, teams in sorted(at):
             for t in teams:
                 hits.append((t, team_to_league.get(t), pos))
-    if not hits:
-        return []
-    hits.sort(key=lambda x: x[2])
     return hits
 
 # ---------- Main ----------
@@ -66,7 +76,7 @@ def main():
     if not os.path.isdir(args.dict):
         raise SystemExit(f"[ERR] Dict dir not found: {args.dict}")
 
-    team_to_league, patterns = load_dictionaries(args.dict)
+    team_to_league, alias_index = load_dictionaries(args.dict)
 
     df = pd.read_csv(args.csv, dtype=str).fillna("")
     out_rows = []
@@ -74,7 +84,7 @@ def main():
 
     for _, r in df.iterrows():
         text = r.get("text", "")
-        hits = detect_teams(text, patterns, team_to_league)
+        hits = detect_teams(text, alias_index, team_to_league)
 
         if len(hits) < 2:
             dropped += 1
@@ -89,7 +99,8 @@ def main():
             dropped += 1
             continue
 
-        items = sorted(uniq.items(), key=lambda kv: kv[1][1])
+        # hits are position-ordered, so first-seen insertion order already is pos order
+        items = list(uniq.items())
         (team1, (lg1, _)), (team2, (lg2, _)) = items[:2]
 
         if lg1 != lg2:
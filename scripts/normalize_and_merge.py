@@ -19,7 +19,7 @@ Usage:
   python scripts/normalize_and_merge.py
 """
 
-import os, re, json, math, sys
+import os, json, math, sys, functools
 from datetime import datetime, timedelta, timezone
 import pandas as pd
 
@@ -84,7 +84,7 @@ def to_canonical(name, alias_map, canon_map):
     if u in alias_map:
         return alias_map[u]
     # last-resort: collapse whitespace
-    u2 = re.sub(r"\s+", " ", u)
+    u2 = " ".join(u.split())
     return alias_map.get(u2, s)
 
 def parse_date(s):
@@ -105,10 +105,15 @@ splits = read_csv(splits_path, required=True)
 tweets = read_csv(tweets_path, required=False)
 alias_map, canon_map = load_dictionaries(dict_dir)
 
+# team strings repeat across rows and tweets; resolve each distinct one once
+@functools.lru_cache(maxsize=None)
+def canon_of(x):
+    return to_canonical(x, alias_map, canon_map)
+
 # ---------- canonicalize split teams ----------
 for col in ["home_team","away_team"]:
     if col in splits.columns:
-        splits[col] = splits[col].apply(lambda x: to_canonical(x, alias_map, canon_map))
+        splits[col] = splits[col].map(canon_of)
     else:
         splits[col] = ""
 
@@ -145,7 +150,7 @@ if not tweets.empty:
         weight = base * factor
 
         for t in teams:
-            canon = to_canonical(t, alias_map, canon_map)
+            canon = canon_of(t)
             team_weight[canon] = team_weight.get(canon, 0.0) + weight
 
 # ---------- apply weights to matchups ----------
@@ -17,9 +17,11 @@ What it does (end-to-end):
     * boardroom/boardroom_picks.md
 """
 
-import argparse, json, os, re, sys, math
-from datetime import datetime, timedelta, timezone
+import argparse, io, json, os, re, sys
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
+import numpy as np
 import pandas as pd
 
 UTC = timezone.utc
@@ -30,9 +32,15 @@ STOP_ENTITIES = {
 }
 
 KEY_COLS_SIGNALS = ["timestamp","entity","text","score"]  # tolerate partial presence
+KEY_COLS_PICKS   = ["entity","total_score","signals","last_seen","sample_text"]
 DEFAULT_HOURS = 72
 HALF_LIFE_HOURS = 24.0  # ~ your exp(-age/24) idea
 
+# splits column-name probes used by possible_clv_boost
+TEAM_COL_RE = re.compile(r"(team|away|home)", re.I)
+OPEN_COL_RE = re.compile(r"open", re.I)
+CURR_COL_RE = re.compile(r"(curr|live|now)", re.I)
+
 def now_utc():
     return datetime.now(UTC)
 
@@ -50,9 +58,19 @@ def parse_time(x: str) -> Optional[datetime]:
     except Exception:
         return None
 
-def load_df(path: str) -> Optional[pd.DataFrame]:
+def load_df(path: str, cols: Optional[List[str]] = None, str_cols: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Read a CSV, optionally keeping only `cols` (missing ones are tolerated) and
+    parsing `str_cols` as plain strings so pandas skips type inference on them.
+    """
+    keep = set(cols) if cols else None
     try:
-        return pd.read_csv(path)
+        return pd.read_csv(
+            path,
+            usecols=(lambda c: c in keep) if keep else None,
+            dtype={c: str for c in str_cols} if str_cols else None,
+            engine="c",
+        )
     except Exception:
         return None
 
@@ -69,22 +87,23 @@ def load_team_dict(path: str) -> Dict[str, List[str]]:
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    alias_map: Dict[str, List[str]] = {}
+    alias_map: Dict[str, set] = {}
 
     def add_alias(key: str, aliases: List[str]):
         key = key.strip().upper()
         if not key: return
         vals = [a.strip().upper() for a in aliases if isinstance(a, str) and a.strip()]
-        alias_map.setdefault(key, [])
-        for v in vals:
-            if v not in alias_map[key]:
-                alias_map[key].append(v)
+        alias_map.setdefault(key, set()).update(vals)
+
+    def as_lists() -> Dict[str, List[str]]:
+        # longest alias first (ties alphabetical) keeps output deterministic
+        return {k: sorted(v, key=lambda a: (-len(a), a)) for k, v in alias_map.items()}
 
     if isinstance(data, dict) and all(isinstance(v, list) for v in data.values()):
         # Simple map: {"KC":[...]}
         for k, vs in data.items():
             add_alias(k, [k] + vs)
-        return alias_map
+        return as_lists()
 
     if isinstance(data, list):
         # NFL style list of dicts
@@ -100,7 +119,7 @@ def load_team_dict(path: str) -> Dict[str, List[str]]:
             if city and name: aliases.append(f"{city} {name}")
             if abr:
                 add_alias(abr, aliases)
-        return alias_map
+        return as_lists()
 
     # CFB nested conferences
     if isinstance(data, dict):
@@ -112,77 +131,88 @@ def load_team_dict(path: str) -> Dict[str, List[str]]:
                 aliases = [team]
                 if abr: aliases.append(abr)
                 add_alias(abr or team, aliases)
-        return alias_map
+        return as_lists()
 
     return {}
 
-def compile_alias_index(team_map: Dict[str, List[str]]) -> List[Tuple[str, re.Pattern]]:
+def compile_alias_index(team_map: Dict[str, List[str]]) -> List[Tuple[str, re.Pattern, Tuple[str, ...]]]:
     idx = []
     for canon, aliases in team_map.items():
-        toks = [re.escape(a) for a in aliases if a and isinstance(a, str)]
-        if not toks: continue
-        pat = r"\b(?:" + "|".join(toks) + r")\b"
-        idx.append((canon, re.compile(pat, flags=re.IGNORECASE)))
+        alias_up = tuple(a.upper() for a in aliases if a and isinstance(a, str))
+        if not alias_up: continue
+        pat = r"\b(?:" + "|".join(re.escape(a) for a in alias_up) + r")\b"
+        idx.append((canon, re.compile(pat, flags=re.IGNORECASE), alias_up))
     # sort longer alias sets first to reduce mis-hits
     idx.sort(key=lambda x: -len(x[0]))
     return idx
 
-def resolve_entity(raw: str, sample_text: str, alias_index) -> Optional[str]:
+def compile_alias_union(alias_index) -> Tuple[Optional[re.Pattern], Dict[str, str]]:
+    """
+    One alternation over every alias (longest first, so the longest alias wins at a
+    given position) plus an alias -> canon map for the matched text. An alias shared
+    by several canons keeps the canon that comes first in alias_index.
+    """
+    alias_to_canon: Dict[str, str] = {}
+    for canon, _, alias_up in alias_index:
+        for a in alias_up:
+            alias_to_canon.setdefault(a, canon)
+    if not alias_to_canon:
+        return None, {}
+    aliases = sorted(alias_to_canon, key=len, reverse=True)
+    rex = re.compile(r"\b(" + "|".join(re.escape(a) for a in aliases) + r")\b", flags=re.IGNORECASE)
+    return rex, alias_to_canon
+
+def resolve_entity(raw: str, sample_text: str, alias_index, alias_union) -> Optional[str]:
     """
     Rules:
     - If raw in stop list → None
     - If raw matches canonical key → ok
-    - Else probe the sample_text for any alias; first hit wins
+    - Else probe the sample_text for any alias; leftmost hit wins
     """
     if not raw: return None
     R = str(raw).strip().upper()
     if R in STOP_ENTITIES: return None
     # if raw looks like canonical (3-5 letters typical), accept if in any canon list
     if alias_index:
-        all_canons = {c for c,_ in alias_index}
+        all_canons = {c for c,_,_ in alias_index}
         if R in all_canons:
             return R
-        # else probe text
-        text = sample_text or ""
-        for canon, rex in alias_index:
-            if rex.search(text):
-                return canon
+        # else probe text with the single union regex
+        rex, alias_to_canon = alias_union
+        m = rex.search(sample_text or "") if rex else None
+        if m:
+            return alias_to_canon[m.group(1).upper()]
     # If no dictionary, fall back to sane token (2-5 capital letters)
     if 2 <= len(R) <= 5 and R.isalpha():
         return R
     return None
 
-def exp_decay_weight(ts: datetime, now: datetime) -> float:
-    if ts is None: 
-        return 0.5  # unknown time — give tiny weight
-    age_h = (now - ts).total_seconds() / 3600.0
-    # weight = exp(-age/24)
-    return math.exp(-age_h / HALF_LIFE_HOURS)
+def parse_time_series(s: pd.Series) -> pd.Series:
+    """Per-row parse_time, collected into one datetime64[ns, UTC] Series (NaT if unparseable)."""
+    return pd.to_datetime(s.map(parse_time), utc=True)
 
 def trend_counts(df: pd.DataFrame, entity: str, now: datetime) -> Tuple[int,int,int,float]:
     """
     Returns: (n72, n24, n6, decayed_sum)
+    Window counts and exp(-age/24) decay are computed on the "_ts" column as
+    NumPy arrays. As in the per-row version, a missing or unparseable stamp (NaT)
+    counts in no window and turns the decay sum into NaN.
     """
     if df is None or df.empty: return (0,0,0,0.0)
-    sub = df[df["entity"] == entity].copy()
+    sub = df.loc[df["entity"] == entity]
     if sub.empty: return (0,0,0,0.0)
-    # parse timestamps
-    if "timestamp" in sub.columns:
-        sub["_ts"] = sub["timestamp"].apply(parse_time)
+    if "_ts" in sub.columns:
+        ts = sub["_ts"]
+    elif "timestamp" in sub.columns:
+        ts = parse_time_series(sub["timestamp"])
     else:
-        sub["_ts"] = None
-    n72 = 0; n24 = 0; n6 = 0; dec = 0.0
-    for _, r in sub.iterrows():
-        ts = r.get("_ts", None)
-        w = exp_decay_weight(ts, now)
-        dec += w
-        if ts:
-            age = (now - ts)
-            if age <= timedelta(hours=72): n72 += 1
-            if age <= timedelta(hours=24): n24 += 1
-            if age <= timedelta(hours=6):  n6 += 1
-        else:
-            n72 += 1
+        ts = pd.Series(pd.NaT, index=sub.index, dtype="datetime64[ns, UTC]")
+    now64 = pd.Timestamp(now).tz_convert(None).to_datetime64()
+    ages_h = (now64 - ts.dt.tz_convert(None).to_numpy()) / np.timedelta64(1, "h")
+    dec = float(np.exp(-ages_h / HALF_LIFE_HOURS).sum())
+    n72 = int((ages_h <= 72).sum())
+    n24 = int((ages_h <= 24).sum())
+    n6  = int((ages_h <= 6).sum())
     return (n72, n24, n6, dec)
 
 def possible_clv_boost(splits: Optional[pd.DataFrame], entity: str) -> int:
@@ -192,21 +222,22 @@ def possible_clv_boost(splits: Optional[pd.DataFrame], entity: str) -> int:
     If not found or ambiguous -> 0 (no boost).
     """
     if splits is None or splits.empty: return 0
-    df = splits.copy()
+    df = splits  # read-only below; no copy needed
 
     # naive entity presence in team columns
-    cols_team = [c for c in df.columns if re.search(r"(team|away|home)", c, re.I)]
+    cols_team = [c for c in df.columns if TEAM_COL_RE.search(c)]
     if not cols_team:
         return 0
-    mask = pd.Series([False]*len(df))
-    for c in cols_team:
-        mask = mask | df[c].astype(str).str.contains(entity, case=False, regex=False, na=False)
-    sub = df[mask].copy()
+    mask = np.logical_or.reduce([
+        df[c].astype(str).str.contains(entity, case=False, regex=False, na=False).to_numpy()
+        for c in cols_team
+    ])
+    sub = df.loc[mask]
     if sub.empty: return 0
 
     # find numeric open/current columns
-    opens = [c for c in sub.columns if re.search(r"open", c, re.I)]
-    curs  = [c for c in sub.columns if re.search(r"(curr|live|now)", c, re.I)]
+    opens = [c for c in sub.columns if OPEN_COL_RE.search(c)]
+    curs  = [c for c in sub.columns if CURR_COL_RE.search(c)]
     if not opens or not curs: 
         return 0
 
@@ -249,9 +280,9 @@ def main():
     os.makedirs("boardroom", exist_ok=True)
 
     # Load files
-    picks_df   = load_df(args.picks_csv)
-    signals_df = load_df(args.signals)
-    splits_df  = load_df(args.splits)
+    picks_df   = load_df(args.picks_csv, cols=KEY_COLS_PICKS, str_cols=["entity","last_seen","sample_text"])
+    signals_df = load_df(args.signals, cols=KEY_COLS_SIGNALS, str_cols=["timestamp","entity","text"])
+    splits_df  = load_df(args.splits)  # team/open/current columns are discovered by name later
 
     # Normalize signals columns (if present)
     if signals_df is not None:
@@ -263,10 +294,13 @@ def main():
             signals_df["timestamp"] = signals_df["timestamp"].astype(str)
         else:
             signals_df["timestamp"] = ""
+        # parse once; trend_counts works off this column for every entity
+        signals_df["_ts"] = parse_time_series(signals_df["timestamp"])
 
     # Load team dictionary
     team_map = load_team_dict(args.teams)  # {CANON: [aliases]}
     alias_index = compile_alias_index(team_map) if team_map else []
+    alias_union = compile_alias_union(alias_index)
 
     # If no picks_df, create empty scaffold
     if picks_df is None or picks_df.empty:
@@ -283,7 +317,7 @@ def main():
     for _, r in picks_df.iterrows():
         ent_raw = (r.get("entity") or "").strip()
         sample  = (r.get("sample_text") or "")
-        ent = resolve_entity(ent_raw, sample, alias_index)
+        ent = resolve_entity(ent_raw, sample, alias_index, alias_union)
         if not ent: 
             continue
         if ent in STOP_ENTITIES:
@@ -304,7 +338,7 @@ def main():
         synth_rows = []
         if signals_df is not None and not signals_df.empty:
             # naive aggregation by alias detection in text
-            for canon, rex in alias_index:
+            for canon, rex, _ in alias_index:
                 sub = signals_df[signals_df["text"].astype(str).str.contains(rex, na=False)]
                 if len(sub) == 0: 
                     continue
@@ -319,7 +353,7 @@ def main():
     if clean.empty:
         # Write empty MD/CSV (no picks) and exit 0
         md = "# Boardroom Picks\n\n_No eligible plays in the last {}h._\n".format(args.hours)
-        open("boardroom/boardroom_picks.md","w",encoding="utf-8").write(md)
+        Path("boardroom/boardroom_picks.md").write_text(md, encoding="utf-8")
         clean.to_csv("boardroom/boardroom_picks.csv", index=False)
         print("[boardroom] no eligible entities; wrote empty files.")
         return
@@ -331,7 +365,7 @@ def main():
         for _, r in signals_df.iterrows():
             e0 = (r.get("entity") or "").strip()
             t0 = (r.get("text") or "")
-            e1 = resolve_entity(e0, t0, alias_index)
+            e1 = resolve_entity(e0, t0, alias_index, alias_union)
             ents.append(e1 or "")
         signals_df = signals_df.assign(entity=ents)
         signals_df = signals_df[signals_df["entity"].astype(bool)]
@@ -371,7 +405,9 @@ def main():
     out = out[(out["score"] >= min(args.star4, args.star5))]
 
     # Sort by score desc, then recency
-    out = out.sort_values(["score","w6","w24","w72"], ascending=[False, False, False, False]).reset_index(drop=True)
+    # (np.lexsort keys run last-to-first, so "score" is the primary key)
+    keys = [-out[c].to_numpy(dtype=float) for c in ["w72","w24","w6","score"]]
+    out = out.iloc[np.lexsort(keys)].reset_index(drop=True)
 
     # Stars
     def stars(s):
@@ -382,7 +418,9 @@ def main():
 
     # Final CSV
     out_csv = out[["entity","score","signals","w24","w6","decayed","clv_boost","last_seen","sample_text"]]
-    out_csv.to_csv("boardroom/boardroom_picks.csv", index=False)
+    buf = io.StringIO()
+    out_csv.to_csv(buf, index=False)
+    Path("boardroom/boardroom_picks.csv").write_bytes(buf.getvalue().encode("utf-8"))
 
     # Markdown render
     md_lines = []
@@ -395,12 +433,12 @@ def main():
     if top5.empty:
         md_lines.append("_None at this time._\n")
     else:
-        for _, r in top5.iterrows():
-            md_lines.append(f"**{r['entity']} — 5★**  (score {r['score']}, signals {r['signals']}; 24h {r['w24']}, 6h {r['w6']}, decay {r['decayed']})")
-            if r["clv_boost"]:
+        for r in top5.itertuples(index=False):
+            md_lines.append(f"**{r.entity} — 5★**  (score {r.score}, signals {r.signals}; 24h {r.w24}, 6h {r.w6}, decay {r.decayed})")
+            if r.clv_boost:
                 md_lines.append("• _CLV positive (+1)_")
-            if r["sample_text"]:
-                md_lines.append(f"> {r['sample_text'][:400]}")
+            if r.sample_text:
+                md_lines.append(f"> {r.sample_text[:400]}")
             md_lines.append("")
 
     md_lines.append("\n## 4★ plays\n")
@@ -408,15 +446,15 @@ def main():
     if top4.empty:
         md_lines.append("_None at this time._\n")
     else:
-        for _, r in top4.iterrows():
-            md_lines.append(f"**{r['entity']} — 4★**  (score {r['score']}, signals {r['signals']}; 24h {r['w24']}, 6h {r['w6']}, decay {r['decayed']})")
-            if r["clv_boost"]:
+        for r in top4.itertuples(index=False):
+            md_lines.append(f"**{r.entity} — 4★**  (score {r.score}, signals {r.signals}; 24h {r.w24}, 6h {r.w6}, decay {r.decayed})")
+            if r.clv_boost:
                 md_lines.append("• _CLV positive (+1)_")
-            if r["sample_text"]:
-                md_lines.append(f"> {r['sample_text'][:300]}")
+            if r.sample_text:
+                md_lines.append(f"> {r.sample_text[:300]}")
             md_lines.append("")
 
-    open("boardroom/boardroom_picks.md","w",encoding="utf-8").write("\n".join(md_lines).strip() + "\n")
+    Path("boardroom/boardroom_picks.md").write_text("\n".join(md_lines).strip() + "\n", encoding="utf-8")
 
     print("[boardroom] wrote clean:")
     print("  - boardroom/boardroom_picks.csv")
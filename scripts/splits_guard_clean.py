@@ -9,7 +9,10 @@ if not os.path.exists(SRC):
     print(f"[guard] {SRC} missing; nothing to do.")
     sys.exit(0)
 
-df = pd.read_csv(SRC)
+# Team names (and stamps) as plain strings so the .str passes below see text, not
+# inferred numbers
+STR_COLS = {"timestamp": str, "away_team": str, "home_team": str}
+df = pd.read_csv(SRC, dtype=STR_COLS)
 
 # Require these columns to exist; otherwise bail safely
 need = {"timestamp","league","away_team","home_team","market","tickets_pct","handle_pct","line","source"}
@@ -21,56 +24,54 @@ if missing:
     sys.exit(0)
 
 # Basic sanitation
-def bad_team(s):
-    if not isinstance(s,str): return True
-    s2 = s.strip()
-    if len(s2) < 2 or len(s2) > 40: return True
-    junk = (
-        "Estimating resolution", "SPORTSBOOK", "Betting Splits", "Expanded Splits",
-        "Money Handle", "Total Handle", "Bets RL", "Spread", "ad", "EF s", "El S"
-    )
-    if any(k.lower() in s2.lower() for k in junk): return True
+JUNK_TEAM = (
+    "Estimating resolution", "SPORTSBOOK", "Betting Splits", "Expanded Splits",
+    "Money Handle", "Total Handle", "Bets RL", "Spread", "ad", "EF s", "El S"
+)
+# Compiled once: any junk fragment (case-insensitive substring), and "has a letter"
+_JUNK_RE = re.compile("|".join(re.escape(k) for k in JUNK_TEAM), re.I)
+_LETTER_RE = re.compile(r"[A-Za-z]")
+
+def bad_team(col):
+    """Vectorized over a team column: missing, wrong length, junk text, or no letters."""
+    s2 = col.str.strip()
+    bad = s2.isna() | ~s2.str.len().between(2, 40)
+    bad |= s2.str.contains(_JUNK_RE, na=True)
     # must contain letters, not only punctuation/numbers
-    if not re.search(r"[A-Za-z]", s2): return True
-    return False
+    bad |= ~s2.str.contains(_LETTER_RE, na=False)
+    return bad
 
-df = df.copy()
+# Upper-cased league/market columns, materialized once
+league_up = df["league"].astype(str).str.upper()
+market_up = df["market"].astype(str).str.upper()
 
 # Drop rows that aren’t real games
-mask_good = (
-    df["league"].astype(str).str.upper().isin([
-        "NFL","NCAAF","NBA","NCAAB","MLB","NHL","WNBA","MLS","UFC"
-    ])
-)
-mask_good &= ~df["away_team"].apply(bad_team)
-mask_good &= ~df["home_team"].apply(bad_team)
-mask_good &= df["market"].astype(str).str.upper().isin(["SPREAD","ML","TOTAL","OU","O/U"])
+mask_good = league_up.isin([
+    "NFL","NCAAF","NBA","NCAAB","MLB","NHL","WNBA","MLS","UFC"
+])
+mask_good &= ~bad_team(df["away_team"])
+mask_good &= ~bad_team(df["home_team"])
+mask_good &= market_up.isin(["SPREAD","ML","TOTAL","OU","O/U"])
 
 # Numeric sanity
-def to_num(x):
-    try:
-        return float(str(x).strip().replace("%",""))
-    except: return float("nan")
+def to_num(col):
+    return pd.to_numeric(col.astype(str).str.strip().str.replace("%", "", regex=False), errors="coerce").astype(float)
 
-df["tickets_pct"] = df["tickets_pct"].map(to_num)
-df["handle_pct"]  = df["handle_pct"].map(to_num)
+df["tickets_pct"] = to_num(df["tickets_pct"])
+df["handle_pct"]  = to_num(df["handle_pct"])
 df["line"] = pd.to_numeric(df["line"], errors="coerce")
 
 mask_good &= df["tickets_pct"].between(0,100, inclusive="both")
 mask_good &= df["handle_pct"].between(0,100, inclusive="both")
 mask_good &= df["line"].abs() < 60  # kill wild OCR
 
-clean = df[mask_good].copy()
-
-# De-dup: keep most recent per (league, away, home, market)
-def to_ts(x):
-    try:
-        return pd.to_datetime(x, utc=True)
-    except:
-        return pd.NaT
+# one parse over the whole column; format="mixed" keeps the old per-cell leniency
+ts = pd.to_datetime(df["timestamp"], utc=True, errors="coerce", format="mixed")
+mask_good &= ts.notna()
 
-clean["ts"] = clean["timestamp"].map(to_ts)
-clean = clean.dropna(subset=["ts"])
+# Single filter with the composite mask, then
+# de-dup: keep most recent per (league, away, home, market)
+clean = df.loc[mask_good].assign(ts=ts[mask_good])
 clean = (clean.sort_values("ts")
               .drop_duplicates(subset=["league","away_team","home_team","market"], keep="last")
               .drop(columns=["ts"]))
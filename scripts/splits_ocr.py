@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
-import os, re, sys, csv, subprocess, pathlib, datetime
+import os, io, re, sys, csv, json, hashlib, subprocess, pathlib, datetime, tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from zoneinfo import ZoneInfo
 
 REPO = pathlib.Path(__file__).resolve().parent.parent
 IMAGES = REPO / "images"
 OUT_CSV = REPO / "splits.csv"
+OCR_CACHE = REPO / ".ocr_cache.json"       # {content digest: tesseract text}
 TZ = ZoneInfo("America/Chicago"); UTC = ZoneInfo("UTC")
+# several tesseract processes run side by side; keep each one single-threaded so
+# they don't oversubscribe the cores (an explicit env setting still wins)
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 
 PERCENT_RX = re.compile(r'\b(100|\d{1,2})%\b')
 ODDS_RX    = re.compile(r'(?<!\d)[-+]\d{3,4}(?!\d)')
 SPREAD_RX  = re.compile(r'(?<!\d)[-+]\d(?:\.\d)?(?!\d)')
 TEAM_RX    = re.compile(r'([A-Za-z .&-]{2,})\s+(?:@|vs\.?|at)\s+([A-Za-z .&-]{2,})', re.I)
+# TEAM_RX's separator on its own: a plain scan that rules out most texts before the
+# backtracking team-name classes are tried at every position
+SEP_RX     = re.compile(r'\s(?:@|vs\.?|at)\s', re.I)
+
+BATCH_MAX = 16                              # images per tesseract list-file run
+MULTIPAGE = (".tif",".tiff",".gif")         # may yield >1 page; always OCR'd alone
+HEAD_CHARS = 2048                           # book/league names sit in the screenshot header
 
 FAMS = {
   "DK_FAM": ["draftkings","draft kings","bets %","handle %"],
@@ -32,24 +45,63 @@ def skip(name:str)->bool:
     if n.startswith(("pregame_","smoke_")): return True
     return not n.endswith((".png",".jpg",".jpeg",".webp",".tif",".tiff",".bmp",".gif",".heic"))
 
-def ocr(path: pathlib.Path)->str:
+def ocr(path: pathlib.Path):
+    """(text, ok) for one image; ok is False when tesseract failed, timed out or is missing."""
     try:
-        out = subprocess.check_output(["tesseract", str(path), "stdout"], stderr=subprocess.STDOUT, timeout=60)
-        return out.decode("utf-8", errors="ignore")
+        # stderr is diagnostics ("Estimating resolution as ..."), not page text; dropped
+        # here as in ocr_batch() so an image's text doesn't depend on which path it took
+        out = subprocess.check_output(["tesseract", str(path), "stdout"], stderr=subprocess.DEVNULL, timeout=60)
+        return out.decode("utf-8", errors="ignore"), True
     except subprocess.CalledProcessError as e:
-        return e.output.decode("utf-8", errors="ignore")
+        return e.output.decode("utf-8", errors="ignore"), False
     except Exception:
-        return ""
+        return "", False
+
+def ocr_batch(paths):
+    """
+    OCR several images in one tesseract run (list-file input) so the model loads once.
+    Pages come back separated by form feeds; if the page count doesn't line up with
+    the inputs, or the run fails, fall back to ocr() per image. Returns (text, ok) per path.
+    """
+    if len(paths) == 1:
+        return [ocr(paths[0])]
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as lf:
+        lf.write("".join(f"{p}\n" for p in paths))
+    try:
+        out = subprocess.check_output(["tesseract", lf.name, "stdout"], stderr=subprocess.DEVNULL,
+                                      timeout=60*len(paths))
+        pages = out.decode("utf-8", errors="ignore").split("\f")
+    except Exception:
+        pages = []
+    finally:
+        os.unlink(lf.name)
+    if len(pages) == len(paths) + 1 and not pages[-1].strip():
+        pages.pop()  # trailing separator after the last page
+    if len(pages) != len(paths):
+        return [ocr(p) for p in paths]
+    return [(t, True) for t in pages]
+
+def batches_of(imgs, size):
+    """Consecutive runs of up to `size` (mtime, path, ...) entries (order kept); multi-page formats alone."""
+    cur = []
+    for e in imgs:
+        if e[1].suffix.lower() in MULTIPAGE:
+            if cur: yield cur; cur = []
+            yield [e]
+            continue
+        cur.append(e)
+        if len(cur) >= size:
+            yield cur; cur = []
+    if cur: yield cur
 
-def fam_of(text:str)->str:
-    t=text.lower()
+# fam_of / market_of / league_guess take text already lower-cased once by parse_one
+def fam_of(t:str)->str:
     for fam, keys in FAMS.items():
         for k in keys:
             if k in t: return fam
     return "TW_OTHER_FAM"
 
-def market_of(text:str)->str:
-    t=text.lower()
+def market_of(t:str)->str:
     if "over/under" in t or "o/u" in t or ("over" in t and "under" in t): return "Total"
     if "spread" in t or "runline" in t or "puck line" in t or "handicap" in t: return "Spread"
     if "moneyline" in t or "money line" in t or " ml " in t: return "ML"
@@ -57,8 +109,8 @@ def market_of(text:str)->str:
     if ODDS_RX.search(t): return "ML"
     return "Unknown"
 
-def percents(text:str):
-    vals = PERCENT_RX.findall(text)
+# percents / likely_split take the first (up to) two PERCENT_RX values, scanned once by parse_one
+def percents(vals):
     if len(vals)>=2: return vals[0], vals[1]
     if len(vals)==1: return vals[0], ""
     return "", ""
@@ -70,61 +122,141 @@ def line_of(text:str):
     return m.group(0) if m else ""
 
 def matchup(text:str):
-    m=TEAM_RX.search(text)
+    m=TEAM_RX.search(text) if SEP_RX.search(text) else None
     if m:
-        a=m.group(1).strip(); h=m.group(2).strip()
-        return re.sub(r'\s+',' ',a)[:64], re.sub(r'\s+',' ',h)[:64]
-    lines=[l.strip() for l in text.splitlines() if l.strip()]
+        # split/join collapses runs of whitespace and trims in one pass, no regex
+        return " ".join(m.group(1).split())[:64], " ".join(m.group(2).split())[:64]
+    # only the first two non-blank lines are needed: strip lazily and stop there
+    lines=list(islice(filter(None, map(str.strip, text.splitlines())), 2))
     return (lines[0][:64], lines[1][:64]) if len(lines)>=2 else ("","")
 
-def likely_split(text:str)->bool:
-    # accept if 2+ % tokens, or (% and odds/spread)
-    pct = len(PERCENT_RX.findall(text))
-    return pct>=2 or (pct>=1 and (ODDS_RX.search(text) or SPREAD_RX.search(text)))
+def likely_split(vals, line:str)->bool:
+    # accept if 2+ % tokens, or (% and odds/spread); line is line_of(text), which
+    # is non-empty exactly when the text has an odds or spread token
+    pct = len(vals)
+    return pct>=2 or (pct>=1 and bool(line))
 
-def league_guess(text:str)->str:
-    t=text.lower()
+def league_guess(t:str)->str:
     if "mlb" in t: return "MLB"
     if "nfl" in t: return "NFL"
     if "nba" in t: return "NBA"
     if "nhl" in t: return "NHL"
     return "Unknown"
 
+HEADER = ("timestamp","league","away_team","home_team","market","tickets_pct","handle_pct","line","source")
+
+def parse_one(mtime: float, text: str):
+    """Parse one image's OCR text; returns its CSV row (HEADER order), or None if it isn't a split."""
+    if not text.strip(): 
+        return None
+    # every percent token contains "%": a substring probe rejects most non-splits pre-regex;
+    # tickets/handle are the first two tokens and nothing looks past them, so stop there
+    pcts = [m.group(1) for m in islice(PERCENT_RX.finditer(text), 2)] if "%" in text else []
+    line = line_of(text) if pcts else ""
+    if not likely_split(pcts, line):
+        return None
+    low = text.lower()
+    head = low[:HEAD_CHARS]
+    fam = fam_of(head)
+    market = market_of(low)
+    tix,hnd = percents(pcts)
+    away,home = matchup(text)
+    ts_iso = to_utc_iso(mtime)
+    L = league_guess(head)
+    return (ts_iso, L, away, home, market, tix, hnd, line, fam)
+
+def digest(path):
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+def load_cache():
+    try:
+        with open(OCR_CACHE, encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    # write-then-rename so a reader never sees a half-written cache; a temp file
+    # left by a failed write is removed (and .ocr_cache.tmp is gitignored)
+    tmp = OCR_CACHE.with_suffix(".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, OCR_CACHE)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def ocr_entries(batch):
+    return ocr_batch([e[1] for e in batch])
+
+def parse_range(imgs, keys, texts, lo, hi):
+    rows = (parse_one(imgs[i][0], texts[keys[i]]) for i in range(lo, hi))
+    return [r for r in rows if r]
+
+def append_rows(rows):
+    """
+    Append rows to OUT_CSV in one O_APPEND write (header first if the file is new or
+    empty), so they land together even if another run is appending to the same file.
+    """
+    if not rows:
+        return 0
+    fd = os.open(OUT_CSV, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        buf = io.StringIO(newline="")
+        w = csv.writer(buf)
+        if os.fstat(fd).st_size == 0: w.writerow(HEADER)
+        w.writerows(rows)
+        data = memoryview(buf.getvalue().encode("utf-8"))
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    return len(rows)
+
 def main():
-    imgs = sorted([p for p in IMAGES.iterdir() if p.is_file() and not skip(p.name)],
-                  key=lambda p: p.stat().st_mtime)
+    # one scandir pass: is_file() comes from the dirent type; stat once per image
+    # for the mtime, which both orders the batch and becomes each row's timestamp
+    with os.scandir(IMAGES) as it:
+        imgs = sorted([(e.stat().st_mtime, pathlib.Path(e.path)) for e in it
+                       if not skip(e.name) and e.is_file()],
+                      key=lambda e: e[0])
     if not imgs:
         print("[INFO] No images.")
         return
-    header = ["timestamp","league","away_team","home_team","market","tickets_pct","handle_pct","line","source"]
-    new=[]
-    for img in imgs:
-        text = ocr(img)
-        if not text.strip(): 
-            continue
-        if not likely_split(text):
-            continue
-        fam = fam_of(text)
-        market = market_of(text)
-        tix,hnd = percents(text)
-        line = line_of(text)
-        away,home = matchup(text)
-        ts_iso = to_utc_iso(img.stat().st_mtime)
-        L = league_guess(text)
-        new.append({
-            "timestamp": ts_iso, "league": L,
-            "away_team": away, "home_team": home,
-            "market": market, "tickets_pct": tix,
-            "handle_pct": hnd, "line": line, "source": fam
-        })
-    if not new:
+    # screenshots are re-listed on every run; key the text on the image bytes so
+    # only images not seen before go through tesseract
+    cache = load_cache()
+    keys = [digest(p) for _, p in imgs]
+    texts = {k: cache[k] for k in keys if k in cache}  # this run's text per image
+    todo = [(mtime, p, i) for i, ((mtime, p), k) in enumerate(zip(imgs, keys)) if k not in texts]
+    # tesseract runs as a subprocess, so threads are enough to keep every core busy
+    workers = os.cpu_count() or 1
+    size = max(1, min(BATCH_MAX, -(-len(todo) // workers)))
+    batches = list(batches_of(todo, size))
+    n = done = 0
+    try:
+        # map() yields in input order: once a batch is back, every image up to its
+        # last one has text, so those rows go out now (mtime order kept) rather than
+        # all at the end
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for batch, ocrd in zip(batches, ex.map(ocr_entries, batches)):
+                for e, (t, ok) in zip(batch, ocrd):
+                    texts[keys[e[2]]] = t
+                    # a failed run is still parsed this time, but only a good one is
+                    # kept, so the image is retried on the next run
+                    if ok: cache[keys[e[2]]] = t
+                upto = batch[-1][2] + 1
+                n += append_rows(parse_range(imgs, keys, texts, done, upto))
+                done = upto
+        n += append_rows(parse_range(imgs, keys, texts, done, len(imgs)))
+    finally:
+        # keep only the images still on disk so the cache doesn't grow without bound
+        save_cache({k: cache[k] for k in keys if k in cache})
+    if not n:
         print("[INFO] No OCR rows extracted.")
         return
-    exists = OUT_CSV.exists()
-    with open(OUT_CSV, "a", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=header)
-        if not exists: w.writeheader()
-        for r in new: w.writerow(r)
-    print(f"[OK] OCR appended {len(new)} rows to {OUT_CSV.name}")
+    print(f"[OK] OCR appended {n} rows to {OUT_CSV.name}")
 if __name__ == "__main__":
     main()